@@ -1,2 +1,40 @@
-from djiutil.convert import *
-from djiutil.files import *
+import importlib
+
+
+# Submodules are imported on first attribute access (PEP 562) so that running the CLI
+# doesn't import every submodule (and its dependencies) up front.
+_SUBMODULE_EXPORTS = {
+    'djiutil.convert': [
+        'DJIRecord', 'convert_srt_to_gpx', 'iter_dji_records', 'iter_dji_subtitle_lines', 'parse_dji_subtitle',
+        'parse_dji_subtitle_lines', 'parse_dji_subtitles',
+    ],
+    'djiutil.files': [
+        'DateFilter', 'DJIFile', 'JSON_OUTPUT_FORMAT', 'PLAIN_OUTPUT_FORMAT', 'cleanup_all_files',
+        'cleanup_low_resolution_video_files', 'cleanup_subtitle_files', 'cleanup_video_files', 'file_exts',
+        'import_files', 'list_dji_files_in_directory', 'play_video_file', 'resolve_dji_directory',
+        'show_dji_files_in_directory',
+    ],
+}
+
+_EXPORTS = {name: module_name for module_name, names in _SUBMODULE_EXPORTS.items() for name in names}
+
+__all__ = list(_EXPORTS)
+
+
+# Submodules that can be accessed as attributes of the package (e.g., djiutil.files) without importing them first.
+_SUBMODULES = ['convert', 'files']
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        # import_module also sets the submodule as an attribute of the package.
+        return importlib.import_module(f'{__name__}.{name}')
+    if (module_name := _EXPORTS.get(name)) is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
@@ -5,44 +5,49 @@
 # - https://github.com/time4tea/gopro-dashboard-overlay
 
 from functools import lru_cache
-from typing import Any, Optional
-import argparse
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional
+import importlib
 import json
 import os
+import re
 import sys
-import types
-
-from djiutil.convert import convert_srt_to_gpx
-from djiutil.files import (
-    DateFilter,
-    JSON_OUTPUT_FORMAT,
-    PLAIN_OUTPUT_FORMAT,
-    cleanup_all_files,
-    cleanup_low_resolution_video_files,
-    cleanup_subtitle_files,
-    cleanup_video_files,
-    import_files,
-    play_video_file,
-    show_dji_files_in_directory,
-)
-
-
-commands = types.SimpleNamespace()
-commands.CLEANUP = 'cleanup'
-commands.CONVERT = 'convert'
-commands.IMPORT = 'import'
-commands.LIST = 'list'
-commands.PLAY = 'play'
 
+if TYPE_CHECKING:
+    import argparse
+
+    from djiutil.files import DateFilter
+
+
+# Subcommand names.
+CLEANUP, CONVERT, IMPORT, LIST, PLAY = 'cleanup', 'convert', 'import', 'list', 'play'
+
+# The djiutil.files and djiutil.convert modules (and their third-party dependencies) are imported only once the
+# selected subcommand is dispatched, so that invocations like `djiutil -h` don't pay for them.
 CLEANUP_FUNCTIONS = {
-    'all': cleanup_all_files,
-    'lrf': cleanup_low_resolution_video_files,
-    'srt': cleanup_subtitle_files,
-    'video': cleanup_video_files,
+    'all': 'djiutil.files:cleanup_all_files',
+    'lrf': 'djiutil.files:cleanup_low_resolution_video_files',
+    'srt': 'djiutil.files:cleanup_subtitle_files',
+    'video': 'djiutil.files:cleanup_video_files',
 }
 
+# Duplicated from djiutil.files to avoid importing it while building the parsers.
+JSON_OUTPUT_FORMAT = 'json'
+PLAIN_OUTPUT_FORMAT = 'plain'
+
+CLEANUP_FILE_TYPES = ('lrf', 'srt', 'video', 'all')
+OUTPUT_FORMATS = (JSON_OUTPUT_FORMAT, PLAIN_OUTPUT_FORMAT)
+
+# Help text shared by the arguments of several subcommands.
+DIR_PATH_HELP = 'path to the directory where DJI files are located'
+DATE_FILTER_HELP = (' by date or age (examples: "<1d", ">1w", "2023-08-28"). Supported units are: h (hours), d (days),'
+                    ' w (weeks), m (months), and y (years).')
+INDEX_HELP = ', as returned by the list subcommand (examples: "1-4", "5,7,8", "21-23,26-29,32")'
+
 DEFAULT_CONFIG_FILE_PATH = '~/.djiutil.json'
 
+# Matches one comma-separated part of an index list, e.g., "23" or "1-4".
+INDEX_RANGE_RE = re.compile(r'\s*(?P<start>\d+)(?:\s*-\s*(?P<end>\d+))?\s*(?:(?P<separator>,)|$)', re.ASCII)
+
 DIR_PATH_CONFIG_KEY = 'dji_dir_path'
 DIR_PATH_ENVIRONMENT_KEY = 'DJIUTIL_DIR_PATH'
 
@@ -51,163 +56,378 @@ DIR_PATH_ENVIRONMENT_KEY = 'DJIUTIL_DIR_PATH'
 JSONConfig = dict[str, Any]
 
 
-@lru_cache(maxsize=32)
+# Parsed command-line arguments. Fields not used by the selected subcommand keep their defaults.
+class ParsedArgs(NamedTuple):
+    command: Optional[str]
+    dir_path: Optional[str] = None
+    date_filter: Optional['DateFilter'] = None
+    index: Optional[str] = None
+    yes: bool = False
+    file_type: Optional[str] = None
+    srt_file_path: Optional[str] = None
+    gpx_file_path: Optional[str] = None
+    dest_path: Optional[str] = None
+    srt: bool = False
+    output: Optional[str] = None
+    include_file_path: bool = False
+    play_index: Optional[int] = None
+
+
+# Config file path --> (modification time of the file in nanoseconds, parsed config).
+config_file_cache: dict[str, tuple[int, JSONConfig]] = {}
+
+
 def load_config_file(file_path: str = DEFAULT_CONFIG_FILE_PATH) -> Optional[JSONConfig]:
     file_path = os.path.expanduser(file_path)
-    if not os.path.exists(file_path):
+    try:
+        mtime_ns = os.stat(file_path).st_mtime_ns
+    except (OSError, ValueError):
+        # Like os.path.exists, treat any error as the config file not existing.
         return None
-    with open(file_path) as f:
-        return json.load(f)
+    if (cached := config_file_cache.get(file_path)) and cached[0] == mtime_ns:
+        return cached[1]
+
+    with open(file_path, 'rb') as f:
+        config_data = f.read()
+    try:
+        import orjson
+    except ImportError:
+        file_config = json.loads(config_data)
+    else:
+        file_config = orjson.loads(config_data)
+    config_file_cache[file_path] = (mtime_ns, file_config)
+    return file_config
 
 
-def resolve_dir_path(cli_config: argparse.Namespace) -> Optional[str]:
-    if cli_dir_path := getattr(cli_config, 'dir_path', None):  # Highest precedence: provided on the command line.
-        return cli_dir_path
-    if DIR_PATH_ENVIRONMENT_KEY in os.environ:  # Second-highest precedence: environment variable.
-        return os.environ[DIR_PATH_ENVIRONMENT_KEY]
+def resolve_dir_path(cli_config: ParsedArgs) -> Optional[str]:
+    if cli_dir_path := cli_config.dir_path:  # Highest precedence: provided on the command line.
+        return os.path.expanduser(cli_dir_path)
+    if env_dir_path := os.environ.get(DIR_PATH_ENVIRONMENT_KEY):  # Second-highest precedence: environment variable.
+        return os.path.expanduser(env_dir_path)
     if (file_config := load_config_file()) and DIR_PATH_CONFIG_KEY in file_config:  # Lowest precedence: config file.
-        return file_config[DIR_PATH_CONFIG_KEY]
+        return os.path.expanduser(file_config[DIR_PATH_CONFIG_KEY])
     return None
 
 
-def create_parsers() -> tuple[argparse.ArgumentParser, dict[str, argparse.ArgumentParser]]:
-    parser = argparse.ArgumentParser(description='manipulate files created by DJI drones')
-    subparsers = parser.add_subparsers(dest='command')
-    command_parsers = {}
+def resolve_function(function_path: str) -> Callable[..., Any]:
+    module_name, function_name = function_path.split(':')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def parse_date_filter(date_filter: str) -> 'DateFilter':
+    from djiutil.files import DateFilter
+    return DateFilter.parse(date_filter)
+
 
-    cleanup_parser = subparsers.add_parser(commands.CLEANUP, help='clean up unwanted DJI files (LRF, SRT, etc.)')
-    cleanup_parser.add_argument('file_type', choices=('lrf', 'srt', 'video', 'all'),
+def add_filter_arguments(parser: 'argparse.ArgumentParser', filtered_noun: str, index_verb: str) -> None:
+    filter_group = parser.add_mutually_exclusive_group()
+    filter_group.add_argument('-d', '--date-filter', type=parse_date_filter,
+                              help=f'filter {filtered_noun}' + DATE_FILTER_HELP)
+    filter_group.add_argument('-i', '--index', '--index-numbers',
+                              help=f'index number(s) of the video file(s) to {index_verb}' + INDEX_HELP)
+
+
+def add_assume_yes_argument(parser: 'argparse.ArgumentParser', action: str) -> None:
+    parser.add_argument('-y', '--yes', '--assume-yes', action='store_true',
+                        help=f'skip user confirmation before {action} files (default: false)')
+
+
+def build_cleanup_parser(cleanup_parser: 'argparse.ArgumentParser') -> None:
+    cleanup_parser.add_argument('file_type', choices=CLEANUP_FILE_TYPES,
                                 help='type of files to clean up (video includes .mov and .mp4 files)')
-    cleanup_parser.add_argument('dir_path', nargs='?', help='path to the directory where DJI files are located')
-    cleanup_filter_group = cleanup_parser.add_mutually_exclusive_group()
-    cleanup_filter_group.add_argument('-d', '--date-filter', type=DateFilter.parse,
-                                      help='filter deleted files by date or age (examples: "<1d", ">1w", "2023-08-28").'
-                                           ' Supported units are: h (hours), d (days), w (weeks), m (months), and'
-                                           ' y (years).')
-    cleanup_filter_group.add_argument('-i', '--index', '--index-numbers',
-                                      help='index number(s) of the video file(s) to delete, as returned by the list '
-                                           'subcommand (examples: "1-4", "5,7,8", "21-23,26-29,32")')
-    cleanup_parser.add_argument('-y', '--yes', '--assume-yes', action='store_true',
-                                help='skip user confirmation before cleaning up files (default: false)')
-    command_parsers[commands.CLEANUP] = cleanup_parser
-
-    convert_parser = subparsers.add_parser(commands.CONVERT, help='convert DJI subtitle files to GPX format')
+    cleanup_parser.add_argument('dir_path', nargs='?', help=DIR_PATH_HELP)
+    add_filter_arguments(cleanup_parser, 'deleted files', 'delete')
+    add_assume_yes_argument(cleanup_parser, 'cleaning up')
+
+
+def build_convert_parser(convert_parser: 'argparse.ArgumentParser') -> None:
     convert_parser.add_argument('srt_file_path',
                                 help='path to the subtitle (.srt) file to convert, '
                                      'or a directory where subtitle files are located')
     convert_parser.add_argument('gpx_file_path', nargs='?',
                                 help='output GPX file path (inferred from srt_file_path if not specified)')
-    command_parsers[commands.CONVERT] = convert_parser
 
-    import_parser = subparsers.add_parser(commands.IMPORT, help='import DJI video and subtitle files')
-    import_parser.add_argument('dir_path', nargs='?', help='path to the directory where DJI files are located')
+
+def build_import_parser(import_parser: 'argparse.ArgumentParser') -> None:
+    import_parser.add_argument('dir_path', nargs='?', help=DIR_PATH_HELP)
     import_parser.add_argument('dest_path', help='path to the directory to import the files to')
-    import_filter_group = import_parser.add_mutually_exclusive_group()
-    import_filter_group.add_argument('-d', '--date-filter', type=DateFilter.parse,
-                                     help='filter imported files by date or age (examples: "<1d", ">1w", "2023-08-28").'
-                                          ' Supported units are: h (hours), d (days), w (weeks), m (months), and'
-                                          ' y (years).')
-    import_filter_group.add_argument('-i', '--index', '--index-numbers',
-                                     help='index number(s) of the video file(s) to import, as returned by the list '
-                                          'subcommand (examples: "1-4", "5,7,8", "21-23,26-29,32")')
+    add_filter_arguments(import_parser, 'imported files', 'import')
     import_parser.add_argument('-s', '--srt', '--include-srt', action='store_true',
                                help='import SRT (subtitle) files in addition to video files (default: false)')
-    import_parser.add_argument('-y', '--yes', '--assume-yes', action='store_true',
-                               help='skip user confirmation before importing files (default: false)')
-    command_parsers[commands.IMPORT] = import_parser
-
-    list_parser = subparsers.add_parser(commands.LIST, help='list DJI files in a directory')
-    list_parser.add_argument('dir_path', nargs='?', help='path to the directory where DJI files are located')
-    list_filter_group = list_parser.add_mutually_exclusive_group()
-    list_filter_group.add_argument('-d', '--date-filter', type=DateFilter.parse,
-                                   help='filter results by date or age (examples: "<1d", ">1w", "2023-08-28").'
-                                   ' Supported units are: h (hours), d (days), w (weeks), m (months), and'
-                                   ' y (years).')
-    list_filter_group.add_argument('-i', '--index', '--index-numbers',
-                                   help='index number(s) of the video file(s) to import, as returned by the list '
-                                        'subcommand (examples: "1-4", "5,7,8", "21-23,26-29,32")')
-    list_parser.add_argument('-o', '--output', '--output-format',
-                             choices=(JSON_OUTPUT_FORMAT, PLAIN_OUTPUT_FORMAT),
+    add_assume_yes_argument(import_parser, 'importing')
+
+
+def build_list_parser(list_parser: 'argparse.ArgumentParser') -> None:
+    list_parser.add_argument('dir_path', nargs='?', help=DIR_PATH_HELP)
+    add_filter_arguments(list_parser, 'results', 'import')
+    list_parser.add_argument('-o', '--output', '--output-format', choices=OUTPUT_FORMATS,
                              help='desired output format (plain format or JSON); default: pretty tabular format')
     list_parser.add_argument('-p', '--include-file-path', action='store_true',
                              help='include video file paths in the listing (default: false)')
-    command_parsers[commands.LIST] = list_parser
 
-    play_parser = subparsers.add_parser(commands.PLAY, help='play a DJI video file by index number')
-    play_parser.add_argument('dir_path', nargs='?', help='path to the directory where DJI files are located')
+
+def build_play_parser(play_parser: 'argparse.ArgumentParser') -> None:
+    play_parser.add_argument('dir_path', nargs='?', help=DIR_PATH_HELP)
     play_parser.add_argument('play_index', metavar='index', type=int,
                              help='index number of the video file to play (as returned by the list subcommand)')
-    command_parsers[commands.PLAY] = play_parser
 
+
+# Subcommand name --> (help text, function to add the subcommand's arguments to its parser).
+COMMAND_PARSERS = {
+    CLEANUP: ('clean up unwanted DJI files (LRF, SRT, etc.)', build_cleanup_parser),
+    CONVERT: ('convert DJI subtitle files to GPX format', build_convert_parser),
+    IMPORT: ('import DJI video and subtitle files', build_import_parser),
+    LIST: ('list DJI files in a directory', build_list_parser),
+    PLAY: ('play a DJI video file by index number', build_play_parser),
+}
+
+
+# Pre-rendered top-level usage and help output (as produced by create_parsers()), printed without building any
+# parsers when djiutil is run with no arguments or with -h/--help. Keep these in sync with COMMAND_PARSERS.
+TOP_LEVEL_USAGE = 'usage: {prog} [-h] {{cleanup,convert,import,list,play}} ...\n'
+TOP_LEVEL_HELP = TOP_LEVEL_USAGE + '''
+manipulate files created by DJI drones
+
+positional arguments:
+  {{cleanup,convert,import,list,play}}
+    cleanup             clean up unwanted DJI files (LRF, SRT, etc.)
+    convert             convert DJI subtitle files to GPX format
+    import              import DJI video and subtitle files
+    list                list DJI files in a directory
+    play                play a DJI video file by index number
+
+options:
+  -h, --help            show this help message and exit
+'''
+
+
+# Only the arguments of the selected subcommand are added; the other subcommands get bare parsers,
+# which is enough for the top-level usage and help output.
+@lru_cache(maxsize=len(COMMAND_PARSERS) + 1)
+def create_parsers(command: Optional[str] = None) -> tuple['argparse.ArgumentParser',
+                                                         dict[str, 'argparse.ArgumentParser']]:
+    # argparse is only imported when the fast path can't handle the arguments (or for usage and help output).
+    import argparse
+    parser = argparse.ArgumentParser(description='manipulate files created by DJI drones')
+    subparsers = parser.add_subparsers(dest='command')
+    command_parsers = {}
+    for command_name, (command_help, build_command_parser) in COMMAND_PARSERS.items():
+        command_parser = subparsers.add_parser(command_name, help=command_help)
+        if command_name == command:
+            build_command_parser(command_parser)
+        command_parsers[command_name] = command_parser
     return parser, command_parsers
 
 
+# Option string --> (destination, whether the option takes a value), for the options understood by parse_args_fast().
+FILTER_OPTIONS = {
+    '-d': ('date_filter', True),
+    '--date-filter': ('date_filter', True),
+    '-i': ('index', True),
+    '--index': ('index', True),
+    '--index-numbers': ('index', True),
+}
+ASSUME_YES_OPTIONS = {'-y': ('yes', False), '--yes': ('yes', False), '--assume-yes': ('yes', False)}
+INCLUDE_SRT_OPTIONS = {'-s': ('srt', False), '--srt': ('srt', False), '--include-srt': ('srt', False)}
+LIST_OPTIONS = {
+    '-o': ('output', True),
+    '--output': ('output', True),
+    '--output-format': ('output', True),
+    '-p': ('include_file_path', False),
+    '--include-file-path': ('include_file_path', False),
+}
+
+# Subcommand name --> (positional arguments as (destination, required) pairs, options), mirroring the parsers above.
+FAST_PATH_ARGUMENTS = {
+    CLEANUP: ((('file_type', True), ('dir_path', False)), FILTER_OPTIONS | ASSUME_YES_OPTIONS),
+    CONVERT: ((('srt_file_path', True), ('gpx_file_path', False)), {}),
+    IMPORT: ((('dir_path', False), ('dest_path', True)), FILTER_OPTIONS | INCLUDE_SRT_OPTIONS | ASSUME_YES_OPTIONS),
+    LIST: ((('dir_path', False),), FILTER_OPTIONS | LIST_OPTIONS),
+    PLAY: ((('dir_path', False), ('play_index', True)), {}),
+}
+
+FAST_PATH_CHOICES = {'file_type': CLEANUP_FILE_TYPES, 'output': OUTPUT_FORMATS}
+FAST_PATH_TYPES = {'date_filter': parse_date_filter, 'play_index': int}
+
+
+# Converts and checks a single argument value like argparse does (type first, then choices), returning None if
+# argparse would reject it. argparse does this for every occurrence of an option, not just the last one.
+def convert_fast_path_value(dest: str, value: str) -> Optional[Any]:
+    if value_type := FAST_PATH_TYPES.get(dest):
+        try:
+            value = value_type(value)
+        except ValueError:
+            return None
+    if (choices := FAST_PATH_CHOICES.get(dest)) is not None and value not in choices:
+        return None
+    return value
+
+
+# Parses the argument forms documented in the help output (full option names, '--option=value', and separate
+# short options) into the same arguments argparse would produce, without building any parsers. Returns None for
+# anything else (help flags, abbreviated or combined options, invalid values, etc.), in which case the caller falls
+# back to argparse, which either handles the arguments or reports the appropriate error.
+def parse_args_fast(args: list[str]) -> Optional[ParsedArgs]:
+    if not args or (command_arguments := FAST_PATH_ARGUMENTS.get(args[0])) is None:
+        return None
+    positional_specs, option_specs = command_arguments
+
+    values = {dest: None if takes_value else False for dest, takes_value in option_specs.values()}
+    positionals = []
+    positionals_interrupted = False
+    i = 1
+    while i < len(args):
+        arg = args[i]
+        i += 1
+        if not arg.startswith('-'):
+            if positionals_interrupted:
+                return None  # argparse matches positionals in contiguous runs; let it handle this.
+            positionals.append(arg)
+            continue
+        positionals_interrupted = bool(positionals)
+        option, separator, value = arg.partition('=') if arg.startswith('--') else (arg, '', '')
+        if (option_spec := option_specs.get(option)) is None:
+            return None
+        dest, takes_value = option_spec
+        if not takes_value:
+            if separator:
+                return None
+            values[dest] = True
+            continue
+        if not separator:
+            if i == len(args) or args[i].startswith('-'):
+                return None
+            value = args[i]
+            i += 1
+        if (value := convert_fast_path_value(dest, value)) is None:
+            return None
+        values[dest] = value
+
+    if values.get('date_filter') is not None and values.get('index') is not None:
+        return None  # Mutually exclusive; let argparse report the error.
+
+    optional_count = len(positionals) - sum(required for _, required in positional_specs)
+    if optional_count < 0 or len(positionals) > len(positional_specs):
+        return None
+    positional_values = iter(positionals)
+    for dest, required in positional_specs:
+        if required or optional_count > 0:
+            optional_count -= not required
+            if (value := convert_fast_path_value(dest, next(positional_values))) is None:
+                return None
+            values[dest] = value
+        else:
+            values[dest] = None
+
+    return ParsedArgs(command=args[0], **values)
+
+
 def parse_index_numbers(index_str: Optional[str]) -> Optional[list[int]]:
     if not index_str:
         return None
 
-    index_numbers = []
-    index_parts = index_str.strip().split(',')
-    for part in index_parts:
-        index_range = part.strip().split('-')
-        if len(index_range) == 1:
-            index_numbers.append(int(index_range[0]))
-        elif len(index_range) == 2:
-            range_start, range_end = index_range
-            index_numbers.extend(list(range(int(range_start), int(range_end) + 1)))
-        else:
+    index_numbers = set()
+    pos = 0
+    while True:
+        # Each part must match on its own, so an error names the part after the last valid one (which is empty
+        # for a trailing comma).
+        if (match := INDEX_RANGE_RE.match(index_str, pos)) is None:
+            part = index_str[pos:].split(',', 1)[0].strip()
             raise ValueError(f'Invalid index value "{part}": expected a single index like "23" or a range like "1-4"')
+        range_start = int(match.group('start'))
+        range_end = int(match.group('end') or range_start)
+        index_numbers.update(range(range_start, range_end + 1))
+        if not match.group('separator'):
+            break
+        pos = match.end()
     return sorted(index_numbers)
 
 
+def run_cleanup_command(config: ParsedArgs, dir_path: Optional[str], date_filter: Optional['DateFilter'],
+                        index_numbers: Optional[list[int]]) -> None:
+    cleanup = resolve_function(CLEANUP_FUNCTIONS[config.file_type])
+    cleanup(dir_path, date_filter=date_filter, index_numbers=index_numbers, assume_yes=config.yes)
+
+
+def run_convert_command(config: ParsedArgs, dir_path: Optional[str], date_filter: Optional['DateFilter'],
+                        index_numbers: Optional[list[int]]) -> None:
+    from djiutil.convert import convert_srt_to_gpx
+    convert_srt_to_gpx(config.srt_file_path, config.gpx_file_path)
+
+
+def run_import_command(config: ParsedArgs, dir_path: Optional[str], date_filter: Optional['DateFilter'],
+                       index_numbers: Optional[list[int]]) -> None:
+    from djiutil.files import import_files
+    import_files(
+        dir_path,
+        config.dest_path,
+        date_filter=date_filter,
+        index_numbers=index_numbers,
+        include_srt_files=config.srt,
+        assume_yes=config.yes,
+    )
+
+
+def run_list_command(config: ParsedArgs, dir_path: Optional[str], date_filter: Optional['DateFilter'],
+                     index_numbers: Optional[list[int]]) -> None:
+    from djiutil.files import show_dji_files_in_directory
+    show_dji_files_in_directory(
+        dir_path,
+        date_filter=date_filter,
+        index_numbers=index_numbers,
+        include_file_path=config.include_file_path,
+        output_format=config.output,
+    )
+
+
+def run_play_command(config: ParsedArgs, dir_path: Optional[str], date_filter: Optional['DateFilter'],
+                     index_numbers: Optional[list[int]]) -> None:
+    from djiutil.files import play_video_file
+    play_video_file(dir_path, config.play_index)
+
+
+COMMAND_HANDLERS = {
+    CLEANUP: run_cleanup_command,
+    CONVERT: run_convert_command,
+    IMPORT: run_import_command,
+    LIST: run_list_command,
+    PLAY: run_play_command,
+}
+
+
 def main(args: Optional[list[str]] = None) -> None:
     if args is None:
         args = sys.argv[1:]
 
-    top_level_parser, command_parsers = create_parsers()
-    config = top_level_parser.parse_args(args)
-    date_filter = getattr(config, 'date_filter', None)
-    index_numbers = parse_index_numbers(getattr(config, 'index', None))
+    if not args or args[0] in ('-h', '--help'):
+        static_output = TOP_LEVEL_HELP if args else TOP_LEVEL_USAGE
+        sys.stdout.write(static_output.format(prog=os.path.basename(sys.argv[0])))
+        return
+
+    if (config := parse_args_fast(args)) is None:
+        command = next((arg for arg in args if not arg.startswith('-')), None)
+        namespace = create_parsers(command if command in COMMAND_PARSERS else None)[0].parse_args(args)
+        config = ParsedArgs(**vars(namespace))
+    if (handler := COMMAND_HANDLERS.get(config.command)) is None:
+        create_parsers()[0].print_usage()
+        return
+
+    date_filter = config.date_filter
+    index_numbers = parse_index_numbers(config.index)
 
     dir_path = None
-    if config.command != commands.CONVERT:  # All commands except 'convert' require a dir_path.
+    if config.command != CONVERT:  # All commands except 'convert' require a dir_path.
         if not (dir_path := resolve_dir_path(config)):
-            command_parsers[config.command].print_usage()
+            create_parsers(config.command)[1][config.command].print_usage()
             return
-        dir_path = os.path.expanduser(dir_path)
-        if not os.path.exists(dir_path):
+        try:
+            os.stat(dir_path)
+        except (OSError, ValueError):
+            # Like os.path.exists, treat any error (e.g., a file in the path, no permission, a NUL byte) as missing.
             print(f'Failed to locate directory {dir_path}!')
             sys.exit(1)
 
-    match config.command:
-        case commands.CLEANUP:
-            if not (cleanup := CLEANUP_FUNCTIONS.get(config.file_type)):
-                command_parsers[config.command].print_usage()
-                return
-            cleanup(dir_path, date_filter=date_filter, index_numbers=index_numbers, assume_yes=config.yes)
-        case commands.CONVERT:
-            convert_srt_to_gpx(config.srt_file_path, config.gpx_file_path)
-        case commands.IMPORT:
-            import_files(
-                dir_path,
-                config.dest_path,
-                date_filter=date_filter,
-                index_numbers=index_numbers,
-                include_srt_files=config.srt,
-                assume_yes=config.yes,
-            )
-        case commands.LIST:
-            show_dji_files_in_directory(
-                dir_path,
-                date_filter=date_filter,
-                index_numbers=index_numbers,
-                include_file_path=config.include_file_path,
-                output_format=getattr(config, 'output', None),
-            )
-        case commands.PLAY:
-            play_video_file(dir_path, config.play_index)
-        case _:
-            top_level_parser.print_usage()
+    handler(config, dir_path, date_filter, index_numbers)
 
 
 if __name__ == '__main__':
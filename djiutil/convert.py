@@ -1,13 +1,18 @@
-from datetime import datetime, timezone
-from typing import Any, Optional
-from xml.etree import ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from itertools import chain, starmap
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional
 import os.path
 import re
-
-import srt
+import stat
+import tempfile
 
 from djiutil.files import file_exts
 
+if TYPE_CHECKING:
+    import srt
+
 
 # Sample DJI SRT data:
 # FrameCnt: 6469, DiffTime: 16ms
@@ -15,116 +20,279 @@ from djiutil.files import file_exts
 # [iso: 160] [shutter: 1/297.91] [fnum: 2.8] [ev: 0] [color_md: default] [focal_len: 24.00] [latitude: 36.27423] [longitude: -41.36214] [rel_alt: 46.000 abs_alt: 19.621] [ct: 5895]
 
 
-__all__ = ['DJIRecord', 'convert_srt_to_gpx', 'parse_dji_subtitle', 'parse_dji_subtitles']
+__all__ = [
+    'DJIRecord', 'convert_srt_to_gpx', 'iter_dji_records', 'iter_dji_subtitle_lines', 'parse_dji_subtitle',
+    'parse_dji_subtitle_lines', 'parse_dji_subtitles',
+]
+
 
+FRAME_RE = re.compile(r'FrameCnt: (?P<frame_count>\d+), DiffTime: (?P<diff_time>\d+)ms', re.ASCII)
+HTML_RE = re.compile('<[^<]+?>', re.ASCII)
 
-FRAME_RE = re.compile(r'FrameCnt: (?P<frame_count>\d+), DiffTime: (?P<diff_time>\d+)ms')
-HTML_RE = re.compile('<[^<]+?>')
-TAG_RE = re.compile(r'\[(?P<data>[^[]+?)]')
+# Bound methods of the patterns used once per record, to skip the attribute lookup in the hot loop.
+match_frame_line = FRAME_RE.match
+remove_html_tags = HTML_RE.sub
 
-FLOAT_TAG_KEYS = {'fnum', 'focal_len'}
-INT_TAG_KEYS = {'ct', 'ev', 'iso'}
+# Metadata tag key --> type to convert the tag's value to (values of other tags are kept as strings).
+TAG_VALUE_TYPES = {
+    'abs_alt': float, 'ct': int, 'ev': int, 'fnum': float, 'focal_len': float, 'iso': int, 'latitude': float,
+    'longitude': float, 'rel_alt': float,
+}
+get_tag_value_type = TAG_VALUE_TYPES.get
 
 ELEVATION_KEY = 'rel_alt'
 
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+SRT_READ_BUFFER_SIZE = 1 << 20  # 1 MiB
+
 GPX_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 GPX_VERSION = '1.1'
 GPX_XMLNS = 'https://www.topografix.com/GPX/1/1'
+GPX_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Offset from the start of a minute to the last moment in that minute.
+LAST_MICROSECOND_OF_MINUTE = timedelta(minutes=1, microseconds=-1)
+
+# Characters that need to be escaped in XML text and attribute values, respectively (matching ElementTree).
+XML_TEXT_ESCAPES = (('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;'))
+XML_ATTRIBUTE_ESCAPES = XML_TEXT_ESCAPES + (('"', '&quot;'), ('\r', '&#13;'), ('\n', '&#10;'), ('\t', '&#09;'))
 
 # Type aliases.
 DJIRecord = dict[str, Any]
 
 
-def parse_dji_subtitle(subtitle: srt.Subtitle) -> DJIRecord:
-    stripped = HTML_RE.sub('', subtitle.content).strip()
+def split_dji_subtitle_content(content: str) -> tuple[str, str, str]:
+    stripped = (remove_html_tags('', content) if '<' in content else content).strip()
     lines = stripped.splitlines()
     if len(lines) != 3:
         raise ValueError(f'Unexpected format for SRT record: expected 3 lines but got {len(lines)}!\n{stripped}')
-    if (match := FRAME_RE.match(lines[0])) is None:
-        raise ValueError(f'Unexpected first line in SRT record: {lines[0]}')
+    return lines[0], lines[1], lines[2]
+
+
+# Reads an SRT file one line at a time, yielding the (frame, timestamp, metadata) lines of each subtitle.
+# Each subtitle block consists of an index line, a timing line, the content lines, and a blank line;
+# the index and timing lines are skipped since the DJI content carries the same information.
+def iter_dji_subtitle_lines(srt_path: str) -> Iterator[tuple[str, str, str]]:
+    with open(srt_path, buffering=SRT_READ_BUFFER_SIZE) as srt_file:
+        block_line_count = 0
+        content_lines = []
+        for line in srt_file:
+            line = line.rstrip()
+            if not line:
+                if content_lines:
+                    yield split_dji_subtitle_content('\n'.join(content_lines))
+                    content_lines.clear()
+                block_line_count = 0
+                continue
+            block_line_count += 1
+            if block_line_count > 2:
+                content_lines.append(line)
+        if content_lines:
+            yield split_dji_subtitle_content('\n'.join(content_lines))
+
+
+# DJI timestamps always look like '2023-08-28 17:26:58.889', so slice out the fields directly rather than going
+# through strptime; anything else (including any other separators) falls back to strptime.
+def parse_dji_timestamp(timestamp: str) -> datetime:
+    if (len(timestamp) == 23 and timestamp[4] == timestamp[7] == '-' and timestamp[10] == ' '
+            and timestamp[13] == timestamp[16] == ':' and timestamp[19] == '.'):
+        # Every other character must be an ASCII digit; int() would also accept signs, spaces, underscores, and
+        # non-ASCII digits, which strptime rejects.
+        digits = (timestamp[0:4] + timestamp[5:7] + timestamp[8:10] + timestamp[11:13] + timestamp[14:16]
+                  + timestamp[17:19] + timestamp[20:23])
+        if digits.isascii() and digits.isdigit():
+            try:
+                return datetime(int(digits[0:4]), int(digits[4:6]), int(digits[6:8]), int(digits[8:10]),
+                                int(digits[10:12]), int(digits[12:14]), int(digits[14:17]) * 1000)
+            except ValueError:
+                pass
+    return datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+
+
+def parse_dji_subtitle_lines(frame_line: str, timestamp_line: str, metadata_line: str) -> DJIRecord:
+    if (match := match_frame_line(frame_line)) is None:
+        raise ValueError(f'Unexpected first line in SRT record: {frame_line}')
     dji_data = {
         'frame_count': int(match.group('frame_count')),
         'diff_time_ms': int(match.group('diff_time')),
-        'timestamp': datetime.strptime(lines[1], '%Y-%m-%d %H:%M:%S.%f'),
+        'timestamp': parse_dji_timestamp(timestamp_line),
     }
 
-    # One tag (set of square brackets) may contain multiple key/value pairs!
-    # Example: [rel_alt: 46.000 abs_alt: 19.621]
-    for tag in TAG_RE.findall(lines[2]):
+    parse_dji_metadata(metadata_line, dji_data)
+    return dji_data
+
+
+# Scans the metadata line for tags (sets of square brackets) without using a regex,
+# adding each tag's key/value pairs to dji_data. Splitting on ']' leaves each tag at the end of a chunk,
+# after the last '[' in that chunk (the final chunk is never part of a closed tag).
+def parse_dji_metadata(metadata_line: str, dji_data: DJIRecord) -> None:
+    for chunk in metadata_line.split(']')[:-1]:
+        if (tag_start := chunk.rfind('[')) == -1:
+            continue
+        tag = chunk[tag_start + 1:]
         items = tag.split()
+        if len(items) == 2:
+            # Most tags contain a single key/value pair.
+            key = items[0].rstrip(':')
+            value = items[1]
+            if value_type := get_tag_value_type(key):
+                value = value_type(value)
+            dji_data[key] = value
+            continue
         if len(items) % 2 > 0:
             raise ValueError(f'Invalid metadata tag in SRT record: {tag}')
-        key = None
-        for i, item in enumerate(items):
-            if i % 2 == 0:
-                key = item.rstrip(':')
-            else:
-                if key in FLOAT_TAG_KEYS:
-                    item = float(item)
-                elif key in INT_TAG_KEYS:
-                    item = int(item)
-                dji_data[key] = item
+        # One tag may contain multiple key/value pairs!
+        # Example: [rel_alt: 46.000 abs_alt: 19.621]
+        for key, value in zip(items[::2], items[1::2]):
+            key = key.rstrip(':')
+            if value_type := get_tag_value_type(key):
+                value = value_type(value)
+            dji_data[key] = value
+
+
+def parse_dji_subtitle(subtitle: 'srt.Subtitle') -> DJIRecord:
+    return parse_dji_subtitle_lines(*split_dji_subtitle_content(subtitle.content))
 
-    return dji_data
 
+def check_frame_counts(records: Iterable[DJIRecord]) -> list[DJIRecord]:
+    checked_records = list(records)
+    # Compare all frame counts at once (in C); only look for the offending record if they don't match.
+    frame_counts = list(map(itemgetter('frame_count'), checked_records))
+    if frame_counts != list(range(1, len(frame_counts) + 1)):
+        frame_count, actual_frame_count = next(
+            (expected, actual) for expected, actual in enumerate(frame_counts, start=1) if expected != actual
+        )
+        raise ValueError(f'Unexpected frame count: expected {frame_count} but got {actual_frame_count}!')
+    return checked_records
 
-def parse_dji_subtitles(subtitles: list[srt.Subtitle]) -> list[DJIRecord]:
-    frame_count = 1
-    records = []
-    for subtitle in subtitles:
-        record = parse_dji_subtitle(subtitle)
+
+# Streaming version of check_frame_counts: checks each record's frame count as the records are consumed.
+def iter_checked_frame_counts(records: Iterable[DJIRecord]) -> Iterator[DJIRecord]:
+    for frame_count, record in enumerate(records, start=1):
         if record['frame_count'] != frame_count:
             raise ValueError(f'Unexpected frame count: expected {frame_count} but got {record["frame_count"]}!')
-        frame_count += 1
-        records.append(record)
-    return records
+        yield record
+
+
+# Parses and checks the records of an SRT file one at a time, so they never all need to be in memory at once.
+def iter_dji_records(srt_path: str) -> Iterator[DJIRecord]:
+    return iter_checked_frame_counts(starmap(parse_dji_subtitle_lines, iter_dji_subtitle_lines(srt_path)))
+
+
+def parse_dji_subtitles(subtitles: list['srt.Subtitle']) -> list[DJIRecord]:
+    return check_frame_counts(map(parse_dji_subtitle, subtitles))
+
+
+def escape_xml(value: str, escapes: tuple[tuple[str, str], ...] = XML_TEXT_ESCAPES) -> str:
+    for char, entity in escapes:
+        if char in value:
+            value = value.replace(char, entity)
+    return value
+
+
+# GPX coordinates and elevations are xsd:decimal values, which can't use exponent notation (e.g., 1e-05).
+def format_gpx_decimal(value: Any, escapes: tuple[tuple[str, str], ...] = XML_TEXT_ESCAPES) -> str:
+    if isinstance(value, str):
+        return escape_xml(value, escapes)
+    text = repr(value)
+    if 'e' in text:
+        text = format(Decimal(text), 'f')
+    return text
+
 
+# Returns the offset from UTC of a naive local time, such that subtracting the offset gives the time in UTC.
+def get_local_utc_offset(timestamp: datetime) -> timedelta:
+    return timestamp - timestamp.astimezone(timezone.utc).replace(tzinfo=None)
 
+
+# Writes the GPX document one track point at a time rather than building the whole tree in memory first.
+# The output is the same as serializing the equivalent ElementTree with an XML declaration.
 # Reference: https://www.topografix.com/gpx/1/1/
-def build_gpx_document(records: list[DJIRecord]) -> ET.ElementTree:
-    root = ET.Element('gpx', version=GPX_VERSION, creator='djiutil', xmlns=GPX_XMLNS)
-    track = ET.SubElement(root, 'trk')
-    name = ET.SubElement(track, 'name')
-    name.text = 'Track 1'
-    segment = ET.SubElement(track, 'trkseg')
-    for record in records:
-        point = ET.SubElement(segment, 'trkpt', lat=record['latitude'], lon=record['longitude'])
-        time = ET.SubElement(point, 'time')
-        time.text = record['timestamp'].astimezone(timezone.utc).strftime(GPX_DATETIME_FORMAT)
-        if ELEVATION_KEY in record:
-            ele = ET.SubElement(point, 'ele')
-            ele.text = record[ELEVATION_KEY]
-    return ET.ElementTree(root)
+# Returns the number of track points written.
+def write_gpx_document(records: Iterable[DJIRecord], gpx_path: str) -> int:
+    with open(gpx_path, 'w', buffering=GPX_WRITE_BUFFER_SIZE, encoding='utf-8', errors='xmlcharrefreplace',
+              newline='\n') as gpx_file:
+        gpx_file.write(f"<?xml version='1.0' encoding='utf-8'?>\n"
+                       f'<gpx version="{GPX_VERSION}" creator="djiutil" xmlns="{GPX_XMLNS}">'
+                       f'<trk><name>Track 1</name>')
+        records = iter(records)
+        if (record := next(records, None)) is None:
+            gpx_file.write('<trkseg /></trk></gpx>')
+            return 0
+
+        gpx_file.write('<trkseg>')
+        point_count = 0
+        # Timestamps are naive local times. Rather than converting each one with astimezone, look up the local
+        # UTC offset once per minute of records and subtract it. If the offset changes within that minute (which
+        # would mean a transition that isn't on a minute boundary), convert each of its timestamps individually.
+        utc_offset = None
+        offset_start = offset_end = datetime.max
+        for point_count, record in enumerate(chain((record,), records), start=1):
+            lat = format_gpx_decimal(record['latitude'], XML_ATTRIBUTE_ESCAPES)
+            lon = format_gpx_decimal(record['longitude'], XML_ATTRIBUTE_ESCAPES)
+            timestamp = record['timestamp']
+            if timestamp.tzinfo is not None:
+                time = timestamp.astimezone(timezone.utc).strftime(GPX_DATETIME_FORMAT)
+            else:
+                if not offset_start <= timestamp <= offset_end:
+                    offset_start = timestamp.replace(second=0, microsecond=0)
+                    offset_end = offset_start + LAST_MICROSECOND_OF_MINUTE
+                    utc_offset = get_local_utc_offset(offset_start)
+                    if get_local_utc_offset(offset_end) != utc_offset:
+                        utc_offset = None
+                offset = get_local_utc_offset(timestamp) if utc_offset is None else utc_offset
+                time = (timestamp - offset).isoformat(timespec='seconds') + 'Z'
+            if ELEVATION_KEY in record:
+                ele = format_gpx_decimal(record[ELEVATION_KEY])
+                gpx_file.write(f'<trkpt lat="{lat}" lon="{lon}"><time>{time}</time><ele>{ele}</ele></trkpt>')
+            else:
+                gpx_file.write(f'<trkpt lat="{lat}" lon="{lon}"><time>{time}</time></trkpt>')
+        gpx_file.write('</trkseg></trk></gpx>')
+    return point_count
+
+
+# mkstemp creates files that only the owner can read, so give the finished file the mode it would have had if it
+# were written in place: the existing file's mode, or the default mode for new files (according to the umask).
+def get_new_file_mode(file_path: str) -> int:
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except (OSError, ValueError):
+        pass
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
 
 
 def convert_srt_to_gpx(srt_file_path: str, gpx_file_path: Optional[str] = None) -> None:
     if os.path.isdir(srt_file_path):
         if gpx_file_path:
             raise ValueError('Must not provide gpx_file_path when converting a directory of SRT files!')
-        srt_files = [
-            os.path.join(srt_file_path, p)
-            for p in os.listdir(srt_file_path)
-            if p.lower().endswith(file_exts.SRT)
-        ]
+        dir_prefix = os.path.join(srt_file_path, '')
+        srt_files = [dir_prefix + p for p in os.listdir(srt_file_path) if p.lower().endswith(file_exts.SRT)]
     else:
         srt_files = [srt_file_path]
 
     for srt_path in srt_files:
-        print(f'Loading records from {srt_path}...')
-        with open(srt_path) as srt_file:
-            srt_data = srt_file.read()
-
-        subtitles = list(srt.parse(srt_data))
-        records = parse_dji_subtitles(subtitles)
-        print(f'Loaded {len(subtitles):,} records from {srt_path}.')
-
         if gpx_file_path is None:
             base_path, _ = os.path.splitext(srt_path)
             gpx_path = f'{base_path}.gpx'
         else:
             gpx_path = gpx_file_path
 
-        xml = build_gpx_document(records)
-        with open(gpx_path, 'wb') as gpx_file:
-            xml.write(gpx_file, xml_declaration=True, encoding='utf-8')
+        # Records are parsed, checked, and written out one at a time, into a temporary file next to the GPX file.
+        # It only replaces gpx_path once every record has been written, so a failed conversion neither leaves a
+        # partial GPX file behind nor destroys an existing one.
+        print(f'Loading records from {srt_path}...')
+        temp_fd, temp_path = tempfile.mkstemp(suffix='.tmp', prefix=f'.{os.path.basename(gpx_path)}.',
+                                              dir=os.path.dirname(gpx_path) or os.curdir)
+        os.close(temp_fd)
+        try:
+            record_count = write_gpx_document(iter_dji_records(srt_path), temp_path)
+            os.chmod(temp_path, get_new_file_mode(gpx_path))
+            os.replace(temp_path, gpx_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        print(f'Loaded {record_count:,} records from {srt_path}.')
         print(f'Successfully wrote {gpx_path}.')
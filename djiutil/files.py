@@ -1,16 +1,19 @@
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import cache, lru_cache
+from operator import attrgetter
+from typing import Iterable, Optional
 import json
+import math
 import os
 import os.path
 import re
+import shutil
 import subprocess
 import sys
+import time
 import types
 
-from tabulate import tabulate
-
 
 __all__ = [
     'DateFilter', 'DJIFile', 'JSON_OUTPUT_FORMAT', 'PLAIN_OUTPUT_FORMAT', 'cleanup_all_files',
@@ -19,19 +22,52 @@ __all__ = [
 ]
 
 
+# Same output as file_created.isoformat(sep=' ', timespec='seconds'), which is used to format the table since it's
+# faster than strftime.
 DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
 
 JSON_OUTPUT_FORMAT = 'json'
 PLAIN_OUTPUT_FORMAT = 'plain'
 
-DEFAULT_TABLE_FORMAT = 'rounded_outline'
-PLAIN_TABLE_FORMAT = 'simple'
+# (begin, fill, separator, end) characters for each horizontal line of a table, and the separator between the cells
+# of each row. The default format has rounded box-drawing borders (like tabulate's 'rounded_outline' format), while
+# the plain format only has a dashed line under the headers (like tabulate's 'simple' format).
+DEFAULT_TABLE_TOP_LINE = ('╭', '─', '┬', '╮')
+DEFAULT_TABLE_HEADER_LINE = ('├', '─', '┼', '┤')
+DEFAULT_TABLE_BOTTOM_LINE = ('╰', '─', '┴', '╯')
+DEFAULT_TABLE_ROW_SEPARATORS = ('│', '│', '│')
+PLAIN_TABLE_HEADER_LINE = ('', '-', '  ', '')
+PLAIN_TABLE_ROW_SEPARATORS = ('', '  ', '')
+
+# Column alignment --> format spec alignment character.
+TABLE_ALIGN_SPECS = {'left': '<', 'center': '^', 'right': '>'}
+
+LIST_TABLE_ALIGN = ('right', 'center', 'center', 'center', 'center')
+LIST_TABLE_ALIGN_WITH_PATH = LIST_TABLE_ALIGN + ('left',)
+LIST_TABLE_HEADERS = ('#', 'LRF', 'SRT', 'Created', 'Size')
+LIST_TABLE_HEADERS_WITH_PATH = LIST_TABLE_HEADERS + ('Video File Path',)
+LIST_TABLE_DIVIDER_ROW = ('───', '─────', '─────', '───────────────────', '────')
 
-LIST_TABLE_ALIGN = ['right', 'center', 'center', 'center', 'center']
-LIST_TABLE_HEADERS = ['#', 'LRF', 'SRT', 'Created', 'Size']
+CHECK_MARK = '✓'
+
+FILE_SIZE_UNITS = 'BKMGT'
 
 GAP_THRESHOLD_SECONDS = 10 * 60  # 10 minutes
 
+# Sorts files by creation time, then by index (only usable when every file has an index).
+DJI_FILE_SORT_KEY = attrgetter('file_created', 'file_index')
+
+# Stat files concurrently once there are enough of them for the syscall latency (e.g., on an SD card
+# or USB card reader) to outweigh the cost of starting the thread pool.
+STAT_THREAD_POOL_THRESHOLD = 32
+STAT_THREAD_POOL_MAX_WORKERS = 8
+
+# Likewise for deleting files.
+DELETE_THREAD_POOL_THRESHOLD = 32
+DELETE_THREAD_POOL_MAX_WORKERS = 8
+# Number of files to delete before writing their status messages.
+DELETE_BATCH_SIZE = 256
+
 file_exts = types.SimpleNamespace()
 file_exts.LRF = '.lrf'
 file_exts.MOV = '.mov'
@@ -54,10 +90,13 @@ file_exts.SRT = '.srt'
 DCIM_PATH = 'DCIM'
 DJI_001_PATH = 'DJI_001'
 
-RSYNC_VERSION_PATTERN = re.compile(r'rsync\s+version\s+(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)')
+# Searched for in the raw (bytes) output of `rsync --version`, so the output doesn't need to be decoded or split
+# into lines; the version is at the start of one of the lines.
+RSYNC_VERSION_PATTERN = re.compile(rb'^rsync\s+version\s+(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)',
+                                   re.MULTILINE)
 
 
-@dataclass
+@dataclass(slots=True)
 class DJIFile:
     file_name: str
     file_ext: str
@@ -66,6 +105,8 @@ class DJIFile:
     file_index: Optional[int] = None
     has_lrf_file: bool = False
     has_srt_file: bool = False
+    # POSIX timestamp of file_created, if known (e.g., the st_ctime the file was listed with).
+    file_created_timestamp: Optional[float] = None
 
     @property
     def file_path(self) -> str:
@@ -78,7 +119,7 @@ class DJIFile:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class DateFilter:
     min_date: Optional[datetime] = None
     max_date: Optional[datetime] = None
@@ -87,18 +128,28 @@ class DateFilter:
     _DAYS_PER_YEAR = 365
     _PATTERN = re.compile(
         r'^((?P<match_type>[<>])(?P<age>\d+)(?P<unit>[dhmwy])|(?P<date>\d{4}-\d{2}-\d{2}))$',
-        re.IGNORECASE
+        re.IGNORECASE | re.ASCII
     )
 
     @classmethod
     def parse(cls, date_filter: str) -> 'DateFilter':
         date_filter = (date_filter or '').strip()
+        # Relative filters (e.g., "<1d") depend on the current time, so they are only reused for up to a minute.
+        now_bucket = int(time.time()) // 60 if date_filter.startswith(('<', '>')) else None
+        min_date, max_date = cls._parse_cached(date_filter, now_bucket)
+        return DateFilter(min_date, max_date)
+
+    # Returns the (min date, max date) of the filter, rather than a DateFilter, so cached results can't be modified.
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _parse_cached(cls, date_filter: str,
+                      now_bucket: Optional[int]) -> tuple[Optional[datetime], Optional[datetime]]:
         if (filter_match := cls._PATTERN.match(date_filter)) is None:
             raise ValueError(f'Invalid date filter "{date_filter}": must be like "<1d" or ">1w" or "2023-08-28"')
         if date := filter_match.group('date'):
-            min_date = datetime.strptime(date, '%Y-%m-%d')
+            min_date = datetime.fromisoformat(date)
             max_date = min_date + timedelta(days=1)
-            return DateFilter(min_date, max_date)
+            return min_date, max_date
         age = int(filter_match.group('age'))
         if age == 0:
             raise ValueError(f'Invalid date filter "{date_filter}": age must not be zero')
@@ -122,24 +173,29 @@ class DateFilter:
             min_date = filter_date
         else:
             max_date = filter_date
-        return DateFilter(min_date, max_date)
+        return min_date, max_date
 
     def matches(self, date: datetime) -> bool:
         return (self.min_date is None or date >= self.min_date) and (self.max_date is None or date <= self.max_date)
 
+    # Returns the (min, max) POSIX timestamps matched by the filter, for checking file times without creating datetimes.
+    def timestamp_bounds(self) -> tuple[float, float]:
+        min_timestamp = -math.inf if self.min_date is None else self.min_date.timestamp()
+        max_timestamp = math.inf if self.max_date is None else self.max_date.timestamp()
+        return min_timestamp, max_timestamp
+
 
 def is_noninteractive_environment() -> bool:
     return not sys.stdout.isatty()
 
 
 # Auto-convert directory path if incomplete, e.g., '/Volumes/Mavic' --> '/Volumes/Mavic/DCIM/DJI_001'.
+# Checking for the subdirectories with isdir takes a stat each, rather than reading the whole directory listing.
 def resolve_dji_directory(dir_path: str) -> str:
-    dir_contents = os.listdir(dir_path)
-    if DCIM_PATH in dir_contents:
-        dir_path = os.path.join(dir_path, DCIM_PATH)
-        dir_contents = os.listdir(dir_path)
-        if DJI_001_PATH in dir_contents:
-            dir_path = os.path.join(dir_path, DJI_001_PATH)
+    if os.path.isdir(dcim_path := os.path.join(dir_path, DCIM_PATH)):
+        dir_path = dcim_path
+        if os.path.isdir(dji_001_path := os.path.join(dir_path, DJI_001_PATH)):
+            dir_path = dji_001_path
     return dir_path
 
 
@@ -149,97 +205,201 @@ def list_dji_files_in_directory(dir_path: str, date_filter: Optional[DateFilter]
     if date_filter and index_numbers:
         raise ValueError(f'Must provide either date_filter or index_numbers, but not both!')
 
-    dir_path = resolve_dji_directory(dir_path)
-    video_files = set()
+    return list_dji_files_in_resolved_directory(resolve_dji_directory(dir_path), date_filter=date_filter,
+                                                index_numbers=index_numbers, file_extension=file_extension)
+
+
+# Same as list_dji_files_in_directory, but for a dir_path that has already been through resolve_dji_directory,
+# so callers that resolve the directory themselves (e.g., for their messages) don't resolve it twice.
+def list_dji_files_in_resolved_directory(dir_path: str, date_filter: Optional[DateFilter] = None,
+                                         index_numbers: Optional[list[int]] = None,
+                                         file_extension: Optional[str] = None) -> list[DJIFile]:
+    listed_file_types = (
+        {file_extension} if file_extension in {file_exts.LRF, file_exts.SRT} else {file_exts.MOV, file_exts.MP4}
+    )
+    # (file name, file extension) --> directory entry, for each file of the type being listed. The entries cache
+    # the information needed to stat the files, so there's no need to join each file name to dir_path.
+    file_entries = {}
     lrf_files = set()
     srt_files = set()
-    for path in os.listdir(dir_path):
-        if path.startswith('.'):
+    # File type --> names of the files of that type. Videos are tracked through file_entries instead, and files of
+    # any other type are skipped.
+    file_names_by_type = {file_exts.LRF: lrf_files, file_exts.SRT: srt_files, file_exts.MOV: None, file_exts.MP4: None}
+    with os.scandir(dir_path) as dir_entries:
+        for entry in dir_entries:
+            # is_file() normally uses the file type from the directory listing, so it doesn't need a syscall.
+            if entry.name.startswith('.') or not entry.is_file():
+                continue
+            # Dot-files were skipped above, so splitting at the last '.' matches os.path.splitext.
+            file_name, dot, file_ext = entry.name.rpartition('.')
+            if not dot:
+                continue
+            file_ext = '.' + file_ext
+            file_type = file_ext.lower()
+            if file_type not in file_names_by_type:
+                continue
+            if (file_names := file_names_by_type[file_type]) is not None:
+                file_names.add(file_name)
+            if file_type in listed_file_types:
+                file_entries[(file_name, file_ext)] = entry
+
+    # Look up indices in a set rather than scanning the list of index numbers for every file.
+    index_number_set = set(index_numbers) if index_numbers else None
+    # Compare the raw creation times against the date filter, and only create datetimes for the files that match.
+    min_ctime, max_ctime = date_filter.timestamp_bounds() if date_filter else (-math.inf, math.inf)
+    # Filter by index before statting anything, so that only the files that can match cost a stat syscall
+    # (the stat result is cached on each entry, which provides both the creation time and the size).
+    candidate_files = []
+    candidate_entries = []
+    for (file_name, file_ext), entry in file_entries.items():
+        index = parse_dji_file_index(file_name)
+        if index_number_set and index not in index_number_set:
             continue
-        file_name, file_ext = os.path.splitext(os.path.basename(path))
-        match file_ext.lower():
-            case file_exts.MOV | file_exts.MP4:
-                video_files.add((file_name, file_ext))
-            case file_exts.LRF:
-                lrf_files.add(file_name)
-            case file_exts.SRT:
-                srt_files.add(file_name)
+        candidate_files.append((file_name, file_ext, index))
+        candidate_entries.append(entry)
 
     dji_files = []
-    file_set = (
-        lrf_files if file_extension == file_exts.LRF else srt_files if file_extension == file_exts.SRT else video_files
-    )
-    for file_name in file_set:
-        if isinstance(file_name, tuple):
-            file_name, file_ext = file_name
-        else:
-            file_ext = file_extension
-        file_info = os.stat(os.path.join(dir_path, file_name + file_ext))
-        created = datetime.fromtimestamp(file_info.st_ctime)
-        if date_filter is None or date_filter.matches(created):
-            index = None
-            name_parts = file_name.split('_')
-            for part in name_parts[::-1]:
-                if part.isdigit():
-                    index = int(part)
-                    break
-            if index_numbers and index not in index_numbers:
-                continue
-            has_lrf = file_name in lrf_files
-            has_srt = file_name in srt_files
-            dji_files.append(DJIFile(file_name=file_name, file_ext=file_ext, file_created=created,
-                                     file_size_bytes=file_info.st_size, file_index=index, has_lrf_file=has_lrf,
-                                     has_srt_file=has_srt))
-    return sorted(dji_files, key=lambda f: (f.file_created, f.file_index))
+    all_files_indexed = True
+    for (file_name, file_ext, index), file_info in zip(candidate_files, stat_dir_entries(candidate_entries)):
+        if not min_ctime <= file_info.st_ctime <= max_ctime:
+            continue
+        if index is None:
+            all_files_indexed = False
+        has_lrf = file_name in lrf_files
+        has_srt = file_name in srt_files
+        dji_files.append(DJIFile(file_name=file_name, file_ext=file_ext,
+                                 file_created=datetime.fromtimestamp(file_info.st_ctime),
+                                 file_size_bytes=file_info.st_size, file_index=index, has_lrf_file=has_lrf,
+                                 has_srt_file=has_srt, file_created_timestamp=file_info.st_ctime))
+    # attrgetter builds the sort keys in C, but can't be used if any index is None (None doesn't compare with int).
+    return sorted(dji_files, key=DJI_FILE_SORT_KEY if all_files_indexed else dji_file_sort_key)
+
+
+# Sorts files by creation time, then by index. Files without an index (i.e., not named by DJI) sort first
+# rather than failing to compare None with an int.
+def dji_file_sort_key(dji_file: DJIFile) -> tuple[datetime, int]:
+    return dji_file.file_created, -1 if dji_file.file_index is None else dji_file.file_index
+
+
+# Returns the last '_'-separated part of the file name which is a number, if any. DJI file names look like
+# 'DJI_20230828172510_0001_D', so check the last two parts directly before splitting up the whole name.
+def parse_dji_file_index(file_name: str) -> Optional[int]:
+    head, _, last_part = file_name.rpartition('_')
+    if last_part.isdigit():
+        return int(last_part)
+    next_to_last_part = head[head.rfind('_') + 1:]
+    if next_to_last_part.isdigit():
+        return int(next_to_last_part)
+    for part in reversed(head.split('_')[:-1]):
+        if part.isdigit():
+            return int(part)
+    return None
+
+
+def stat_dir_entries(entries: Iterable[os.DirEntry]) -> list[os.stat_result]:
+    entries = list(entries)
+    if len(entries) < STAT_THREAD_POOL_THRESHOLD:
+        return [entry.stat() for entry in entries]
+    # Threads release the GIL while waiting on the stat syscalls, so their latencies overlap.
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=STAT_THREAD_POOL_MAX_WORKERS) as executor:
+        return list(executor.map(os.DirEntry.stat, entries))
 
 
 # Reference: https://stackoverflow.com/a/1094933
+# The unit is picked from the bit length of the size (each unit is 2**10 times the previous one),
+# so only one division is needed.
 def format_file_size(size_in_bytes: int) -> str:
-    for unit in ('B', 'K', 'M', 'G'):
-        if abs(size_in_bytes) < 1024.0:
-            precision = 1 if unit == 'G' or size_in_bytes < 10.0 else 0
-            return f'{size_in_bytes:3.{precision}f}{unit}'
-        size_in_bytes /= 1024.0
-    return f'{size_in_bytes:.1f}T'
+    unit_index = min(max((abs(size_in_bytes).bit_length() - 1) // 10, 0), len(FILE_SIZE_UNITS) - 1)
+    unit = FILE_SIZE_UNITS[unit_index]
+    size = size_in_bytes / (1 << (10 * unit_index))
+    if unit == 'T':
+        return f'{size:.1f}T'
+    precision = 1 if unit == 'G' or size < 10.0 else 0
+    return f'{size:3.{precision}f}{unit}'
+
+
+def build_table_line(col_widths: list[int], padding: str, begin: str, fill: str, separator: str, end: str) -> str:
+    return (begin + separator.join(fill * (width + 2 * len(padding)) for width in col_widths) + end).rstrip()
+
+
+def build_table_row(cells: Iterable[str], col_specs: list[str], padding: str, begin: str, separator: str,
+                    end: str) -> str:
+    padded_cells = (padding + format(cell, spec) + padding for cell, spec in zip(cells, col_specs))
+    return (begin + separator.join(padded_cells) + end).rstrip()
+
+
+# Renders rows of strings as a table with a header row. Cells are stripped and each column is as wide as its widest
+# cell, but at least two characters wider than its header; the header is aligned the same way as the rest of its column.
+def render_table(rows: list[tuple[str, ...]], headers: tuple[str, ...], col_align: tuple[str, ...],
+                 plain: bool = False) -> str:
+    rows = [[cell.strip() for cell in row] for row in rows]
+    col_widths = [
+        max(len(header) + 2, max((len(row[col]) for row in rows), default=0)) for col, header in enumerate(headers)
+    ]
+    col_specs = [f'{TABLE_ALIGN_SPECS[align]}{width}' for align, width in zip(col_align, col_widths)]
+    if plain:
+        padding = ''
+        row_separators = PLAIN_TABLE_ROW_SEPARATORS
+        lines = [
+            build_table_row(headers, col_specs, padding, *row_separators),
+            build_table_line(col_widths, padding, *PLAIN_TABLE_HEADER_LINE),
+        ]
+    else:
+        padding = ' '
+        row_separators = DEFAULT_TABLE_ROW_SEPARATORS
+        lines = [
+            build_table_line(col_widths, padding, *DEFAULT_TABLE_TOP_LINE),
+            build_table_row(headers, col_specs, padding, *row_separators),
+            build_table_line(col_widths, padding, *DEFAULT_TABLE_HEADER_LINE),
+        ]
+    lines.extend(build_table_row(row, col_specs, padding, *row_separators) for row in rows)
+    if not plain:
+        lines.append(build_table_line(col_widths, padding, *DEFAULT_TABLE_BOTTOM_LINE))
+    return '\n'.join(lines)
 
 
 def format_dji_files_as_table(dir_path: str, dji_files: list[DJIFile], include_file_path: bool = False,
                               output_format: Optional[str] = None) -> str:
     output_format = (output_format or '').lower()
-    table_format = PLAIN_TABLE_FORMAT if output_format == PLAIN_OUTPUT_FORMAT else DEFAULT_TABLE_FORMAT
-    headers = LIST_TABLE_HEADERS.copy()
-    col_align = LIST_TABLE_ALIGN.copy()
-    path_divider = None
-    if include_file_path:
-        headers.append('Video File Path')
-        col_align.append('left')
-        if not output_format:
-            path_divider = '─' * len(os.path.join(dir_path, dji_files[0].file_path))
-
+    # The header and alignment tuples are shared constants, so there's nothing to copy or append to.
+    headers = LIST_TABLE_HEADERS_WITH_PATH if include_file_path else LIST_TABLE_HEADERS
+    col_align = LIST_TABLE_ALIGN_WITH_PATH if include_file_path else LIST_TABLE_ALIGN
+    path_divider = ''
+    if include_file_path and not output_format:
+        path_divider = '─' * len(os.path.join(dir_path, dji_files[0].file_path))
+
+    divider_row = None
+    if output_format != PLAIN_OUTPUT_FORMAT:
+        divider_row = LIST_TABLE_DIVIDER_ROW + (path_divider,) if include_file_path else LIST_TABLE_DIVIDER_ROW
+
+    # Joining dir_path with '' adds the trailing path separator, so each file path is a simple concatenation.
+    dir_prefix = os.path.join(dir_path, '')
     files_table = []
-    prev_file = None
+    # Check for gaps by comparing POSIX timestamps, rather than creating a timedelta for every file.
+    prev_timestamp = None
     for dji_file in dji_files:
         name = dji_file.file_name if dji_file.file_index is None else f'{dji_file.file_index:,}'
-        lrf = '✓' if dji_file.has_lrf_file else ''
-        srt = '✓' if dji_file.has_srt_file else ''
-        created = dji_file.file_created.strftime(DATETIME_FORMAT)
+        lrf = CHECK_MARK if dji_file.has_lrf_file else ''
+        srt = CHECK_MARK if dji_file.has_srt_file else ''
+        created = dji_file.file_created.isoformat(sep=' ', timespec='seconds')
         size = format_file_size(dji_file.file_size_bytes)
-        if prev_file and (dji_file.file_created - prev_file.file_created).total_seconds() > GAP_THRESHOLD_SECONDS:
-            if output_format != PLAIN_OUTPUT_FORMAT:
-                divider_row = ['───', '─────', '─────', '───────────────────', '────']
-                if include_file_path:
-                    divider_row.append(path_divider)
+        if (timestamp := dji_file.file_created_timestamp) is None:
+            timestamp = dji_file.file_created.timestamp()
+        if prev_timestamp is not None and timestamp - prev_timestamp > GAP_THRESHOLD_SECONDS:
+            if divider_row:
                 files_table.append(divider_row)
-        file_row = [name, lrf, srt, created, size]
         if include_file_path:
-            file_row.append(os.path.join(dir_path, dji_file.file_path))
-        files_table.append(file_row)
-        prev_file = dji_file
+            files_table.append((name, lrf, srt, created, size, dir_prefix + dji_file.file_path))
+        else:
+            files_table.append((name, lrf, srt, created, size))
+        prev_timestamp = timestamp
 
-    return tabulate(files_table, headers=headers, tablefmt=table_format, colalign=col_align)
+    return render_table(files_table, headers, col_align, plain=output_format == PLAIN_OUTPUT_FORMAT)
 
 
 def format_dji_files_as_json(dir_path: str, dji_files: list[DJIFile], include_file_path: bool = False) -> str:
+    dir_prefix = os.path.join(dir_path, '')
     json_files = []
     for dji_file in dji_files:
         json_file = {
@@ -251,9 +411,10 @@ def format_dji_files_as_json(dir_path: str, dji_files: list[DJIFile], include_fi
             'size_in_bytes': dji_file.file_size_bytes,
         }
         if include_file_path:
-            json_file['path'] = os.path.join(dir_path, dji_file.file_path)
+            json_file['path'] = dir_prefix + dji_file.file_path
         json_files.append(json_file)
-    return json.dumps(json_files)
+    # Compact separators keep the output (and the work of writing it) smaller for large directories.
+    return json.dumps(json_files, separators=(',', ':'))
 
 
 def show_dji_files_in_directory(dir_path: str, date_filter: Optional[DateFilter] = None,
@@ -263,7 +424,7 @@ def show_dji_files_in_directory(dir_path: str, date_filter: Optional[DateFilter]
         raise ValueError(f'Must provide either date_filter or index_numbers, but not both!')
 
     dir_path = resolve_dji_directory(dir_path)
-    dji_files = list_dji_files_in_directory(dir_path, date_filter=date_filter, index_numbers=index_numbers)
+    dji_files = list_dji_files_in_resolved_directory(dir_path, date_filter=date_filter, index_numbers=index_numbers)
     if not dji_files:
         filter_error = f' matching the provided date filter' if date_filter else ''
         index_error = ' matching the provided indices' if index_numbers else ''
@@ -294,14 +455,8 @@ def cleanup_subtitle_files(dir_path: str, date_filter: Optional[DateFilter] = No
 
 def cleanup_video_files(dir_path: str, date_filter: Optional[DateFilter] = None,
                         index_numbers: Optional[list[int]] = None, assume_yes: bool = False) -> None:
-    count = cleanup_files_by_type(dir_path, file_extension=file_exts.MOV, date_filter=date_filter,
-                                  index_numbers=index_numbers, assume_yes=assume_yes, ignore_empty=True)
-    count += cleanup_files_by_type(dir_path, file_extension=file_exts.MP4, date_filter=date_filter,
-                                   index_numbers=index_numbers, assume_yes=assume_yes, ignore_empty=True)
-    if not count:
-        filter_error = ' matching the provided date filter' if date_filter else ''
-        index_error = ' matching the provided indices' if index_numbers else ''
-        print(f'No video files{filter_error}{index_error} found in directory {resolve_dji_directory(dir_path)}!')
+    # Omitting the file extension selects both .mov and .mp4 files in a single pass over the directory.
+    cleanup_files_by_type(dir_path, date_filter=date_filter, index_numbers=index_numbers, assume_yes=assume_yes)
 
 
 def cleanup_all_files(dir_path: str, date_filter: Optional[DateFilter] = None,
@@ -313,7 +468,7 @@ def cleanup_all_files(dir_path: str, date_filter: Optional[DateFilter] = None,
                            assume_yes=True, ignore_empty=True)
 
 
-def cleanup_files_by_type(dir_path: str, file_extension: str, date_filter: Optional[DateFilter] = None,
+def cleanup_files_by_type(dir_path: str, file_extension: Optional[str] = None, date_filter: Optional[DateFilter] = None,
                           index_numbers: Optional[list[int]] = None, assume_yes: bool = False,
                           ignore_empty: bool = False) -> int:
     if date_filter and index_numbers:
@@ -321,8 +476,8 @@ def cleanup_files_by_type(dir_path: str, file_extension: str, date_filter: Optio
 
     dir_path = resolve_dji_directory(dir_path)
     file_type = file_extension.lstrip('.').upper() if file_extension in {file_exts.LRF, file_exts.SRT} else 'video'
-    cleanup_files = list_dji_files_in_directory(dir_path, date_filter=date_filter, index_numbers=index_numbers,
-                                                file_extension=file_extension)
+    cleanup_files = list_dji_files_in_resolved_directory(dir_path, date_filter=date_filter,
+                                                         index_numbers=index_numbers, file_extension=file_extension)
 
     if not cleanup_files:
         if not ignore_empty:
@@ -346,23 +501,62 @@ def cleanup_files_by_type(dir_path: str, file_extension: str, date_filter: Optio
         if resp.lower() not in {'y', 'ye', 'yes', 'yee'}:
             sys.exit(0)
 
-    for cleanup_file in cleanup_files:
-        cleanup_file_path = os.path.join(dir_path, cleanup_file.file_path)
-        print(f'Deleting {cleanup_file_path}...')
-        os.remove(cleanup_file_path)
-
-    print(f'Successfully deleted {len(cleanup_files)} {file_type} {files_pluralized}.')
-    return len(cleanup_files)
+    dir_prefix = os.path.join(dir_path, '')
+    cleanup_file_paths = [dir_prefix + cleanup_file.file_path for cleanup_file in cleanup_files]
+    failed_count = 0
+    # Delete the files in batches, writing the status messages for each batch (all at once, rather than doing a
+    # write to stdout per file) once its deletes have finished, so they only report what actually happened.
+    for batch_start in range(0, len(cleanup_file_paths), DELETE_BATCH_SIZE):
+        batch_file_paths = cleanup_file_paths[batch_start:batch_start + DELETE_BATCH_SIZE]
+        delete_errors = dict(delete_files(batch_file_paths))
+        failed_count += len(delete_errors)
+        sys.stdout.write(''.join(
+            f'Failed to delete {file_path}: {delete_errors[file_path]}\n' if file_path in delete_errors
+            else f'Deleting {file_path}...\n'
+            for file_path in batch_file_paths
+        ))
+
+    deleted_count = len(cleanup_files) - failed_count
+    if failed_count:
+        print(f'Deleted {deleted_count} of {len(cleanup_files)} {file_type} files; failed to delete {failed_count}!')
+        sys.exit(1)
+    print(f'Successfully deleted {deleted_count} {file_type} {files_pluralized}.')
+    return deleted_count
+
+
+# Returns the error that prevented the file from being deleted, if any. A file that is already gone counts as deleted.
+def delete_file(file_path: str) -> Optional[OSError]:
+    try:
+        os.unlink(file_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        return e
+    return None
+
+
+# Tries to delete every file, whether or not some of them fail, and returns the (file path, error) pairs of the files
+# that couldn't be deleted.
+def delete_files(file_paths: list[str]) -> list[tuple[str, OSError]]:
+    if len(file_paths) < DELETE_THREAD_POOL_THRESHOLD:
+        delete_errors = [delete_file(file_path) for file_path in file_paths]
+    else:
+        # Like stat, unlink releases the GIL, so deleting files from several threads overlaps their latencies.
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=DELETE_THREAD_POOL_MAX_WORKERS) as executor:
+            delete_errors = list(executor.map(delete_file, file_paths))
+    return [(file_path, error) for file_path, error in zip(file_paths, delete_errors) if error is not None]
 
 
+# The installed rsync doesn't change while running, so only run `rsync --version` once.
+@cache
 def check_rsync_major_version() -> int:
-    which_result = subprocess.run(['which', 'rsync'], stdout=subprocess.DEVNULL)
-    if which_result.returncode != 0:
+    # shutil.which searches PATH directly rather than running `which` in a subprocess.
+    if shutil.which('rsync') is None:
         raise RuntimeError('Must have rsync installed to import files!')
     version_result = subprocess.run(['rsync', '--version'], capture_output=True)
-    for line in version_result.stdout.splitlines():
-        if match := RSYNC_VERSION_PATTERN.match(line.decode('utf-8')):
-            return int(match.group('major'))
+    if match := RSYNC_VERSION_PATTERN.search(version_result.stdout):
+        return int(match.group('major'))
     raise RuntimeError('Failed to parse `rsync --version` output!')
 
 
@@ -373,7 +567,7 @@ def import_files(dir_path: str, dest_path: str, date_filter: Optional[DateFilter
         raise ValueError(f'Must provide either date_filter or index_numbers, but not both!')
 
     dir_path = resolve_dji_directory(dir_path)
-    dji_files = list_dji_files_in_directory(dir_path, date_filter=date_filter, index_numbers=index_numbers)
+    dji_files = list_dji_files_in_resolved_directory(dir_path, date_filter=date_filter, index_numbers=index_numbers)
     if not dji_files:
         filter_error = ' matching the provided date filter' if date_filter else ''
         index_error = ' matching the provided indices' if index_numbers else ''
@@ -406,9 +600,15 @@ def import_files(dir_path: str, dest_path: str, date_filter: Optional[DateFilter
         print(f'Creating directory {dest_path}...')
         os.makedirs(dest_path)
 
-    file_paths = [os.path.join(dir_path, f.file_path) for f in dji_files]
-    if include_srt_files:
-        file_paths.extend([os.path.join(dir_path, f.srt_file_path) for f in dji_files if f.has_srt_file])
+    dir_prefix = os.path.join(dir_path, '')
+    file_paths = []
+    srt_file_paths = []
+    for dji_file in dji_files:
+        file_paths.append(dir_prefix + dji_file.file_path)
+        if include_srt_files and dji_file.has_srt_file:
+            srt_file_paths.append(dir_prefix + dji_file.srt_file_path)
+    # The SRT files are copied after all of the videos.
+    file_paths.extend(srt_file_paths)
 
     rsync_version = check_rsync_major_version()
     rsync_args = [
@@ -422,7 +622,7 @@ def import_files(dir_path: str, dest_path: str, date_filter: Optional[DateFilter
 
 def play_video_file(dir_path: str, index: int) -> None:
     dir_path = resolve_dji_directory(dir_path)
-    dji_files = list_dji_files_in_directory(dir_path)
+    dji_files = list_dji_files_in_resolved_directory(dir_path)
     if (dji_file := next((f for f in dji_files if f.file_index == index), None)) is None:
         print(f'Failed to find video file with index #{index} in directory {dir_path}!')
         return